@@ -25,6 +25,28 @@ class Settings(BaseSettings):
 
     token_lifetime_hours: int = Field(8, env="TOKEN_LIFETIME_HOURS")
 
+    # asyncpg pool sizing. min_size connections are opened up-front so the
+    # first burst of requests doesn't pay connection-setup latency; max_size
+    # bounds concurrency against Postgres.
+    db_pool_min_size: int = Field(10, env="DB_POOL_MIN_SIZE")
+
+    db_pool_max_size: int = Field(50, env="DB_POOL_MAX_SIZE")
+
+    # Argon2 cost parameters. Production keeps the library defaults; dev/CI
+    # seeds can lower them (e.g. ARGON2_TIME_COST=1, ARGON2_MEMORY_COST=8192)
+    # so hashing the seed admin doesn't dominate container start-up. Hashes
+    # created with lower parameters are transparently upgraded on first login.
+    argon2_time_cost: int = Field(3, env="ARGON2_TIME_COST")
+
+    argon2_memory_cost: int = Field(65536, env="ARGON2_MEMORY_COST")
+
+    # When enabled, every authenticated request re-checks that the token's
+    # user still exists in the database. Off by default: the signed claims
+    # are trusted for the token lifetime, saving a DB round-trip per request.
+    verify_user_on_each_request: bool = Field(
+        False, env="VERIFY_USER_ON_EACH_REQUEST"
+    )
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -5,25 +5,177 @@ The API uses an async connection pool. A dependency is provided to
 FastAPI endpoints to acquire and release a database connection.
 """
 
+import logging
+import os
+import weakref
+from pathlib import Path
+
 import asyncpg
+import orjson
 from fastapi import Depends
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict
 
 from .config import get_settings
 
+logger = logging.getLogger("rtls.db")
+
+
+# Hot-path queries prepared once per connection at pool init. Handlers look
+# them up via get_prepared(conn, name) instead of passing raw SQL, saving the
+# parse/plan round-trip on every request.
+HOT_STATEMENTS = {
+    "list_anchors": "SELECT id, name, x, y, z, created_at FROM anchors ORDER BY id",
+    "list_wearables": "SELECT uid, person_ref, role, created_at FROM wearables ORDER BY uid",
+    "stats_summary": "SELECT * FROM stats_summary",
+    # Latest scan values per wearable. Each LATERAL walks idx_scans_uid_ts_incl
+    # backwards and stops at the first non-null row, so cost is independent of
+    # history size (unlike aggregating the whole hypertable per uid).
+    "latest_scans": """
+        SELECT
+            w.uid,
+            r.rssi AS last_rssi,
+            b.battery AS last_battery,
+            t.temp_c AS last_temp_c,
+            p.tx_power_dbm AS last_tx_power,
+            e.emergency AS last_emergency,
+            s.ts AS last_seen
+        FROM wearables w
+        JOIN LATERAL (
+            SELECT ts FROM scans WHERE uid = w.uid
+            ORDER BY ts DESC LIMIT 1
+        ) s ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT rssi FROM scans WHERE uid = w.uid AND rssi IS NOT NULL
+            ORDER BY ts DESC LIMIT 1
+        ) r ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT battery FROM scans WHERE uid = w.uid AND battery IS NOT NULL
+            ORDER BY ts DESC LIMIT 1
+        ) b ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT temp_c FROM scans WHERE uid = w.uid AND temp_c IS NOT NULL
+            ORDER BY ts DESC LIMIT 1
+        ) t ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT tx_power_dbm FROM scans WHERE uid = w.uid AND tx_power_dbm IS NOT NULL
+            ORDER BY ts DESC LIMIT 1
+        ) p ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT emergency FROM scans WHERE uid = w.uid AND emergency IS NOT NULL
+            ORDER BY ts DESC LIMIT 1
+        ) e ON TRUE
+    """,
+    "latest_anchor_status": """
+        SELECT DISTINCT ON (anchor_id)
+            anchor_id, ts, ip, fw, uptime_s, wifi_rssi, heap_free, heap_min,
+            chip_temp_c, tx_power_dbm, ble_scan_active
+        FROM anchor_status
+        ORDER BY anchor_id, ts DESC
+    """,
+}
+
+# asyncpg.Connection defines __slots__, so the per-connection statement dict
+# cannot live as an attribute on the connection; key it weakly on the
+# connection instead, so entries vanish when the connection is collected.
+_conn_stmts: "weakref.WeakKeyDictionary[asyncpg.Connection, Dict[str, asyncpg.prepared_stmt.PreparedStatement]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def reset_connection(conn: asyncpg.Connection) -> None:
+    """Lightweight connection reset run on release back to the pool.
+
+    The default reset script unlistens, unlocks and discards state in a
+    server round-trip on every release; the API never leaves session state
+    behind, so rolling back a stray transaction is all that's needed.
+    """
+    if conn.is_in_transaction():
+        await conn.execute("ROLLBACK")
+
+
+async def init_connection(conn: asyncpg.Connection) -> None:
+    """Register per-connection type codecs and prepared statements.
+
+    JSONB columns are decoded into Python dicts by the driver itself, so
+    callers never have to json.loads row values by hand.
+    """
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=lambda v: orjson.dumps(v).decode(),
+        decoder=orjson.loads,
+        schema="pg_catalog",
+        format="text",
+    )
+    # numeric decodes straight to float instead of decimal.Decimal, so rows
+    # never need Python-level float(...) conversions downstream
+    await conn.set_type_codec(
+        "numeric",
+        encoder=str,
+        decoder=float,
+        schema="pg_catalog",
+        format="text",
+    )
+    _conn_stmts[conn] = {
+        name: await conn.prepare(sql) for name, sql in HOT_STATEMENTS.items()
+    }
+
+
+def get_prepared(conn: asyncpg.Connection, name: str) -> asyncpg.prepared_stmt.PreparedStatement:
+    """Return the prepared statement registered under `name` for this connection.
+
+    Accepts either a raw connection or the PoolConnectionProxy handed out by
+    pool.acquire(); statements are keyed on the underlying connection the
+    pool's init hook saw, so the proxy is unwrapped first.
+    """
+    return _conn_stmts[getattr(conn, "_con", conn)][name]
+
 
 class Database:
     """Manages a connection pool to PostgreSQL using asyncpg."""
 
-    def __init__(self, dsn: str) -> None:
+    def __init__(self, dsn: str, min_size: int = 10, max_size: int = 50) -> None:
         self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
         self._pool: asyncpg.Pool | None = None
 
+    async def _apply_upgrades(self) -> None:
+        """Run the idempotent upgrade DDL against an existing database.
+
+        initdb only sees schema.sql on a fresh volume, so objects added
+        later (stats_summary, the positions NOTIFY trigger, new indexes)
+        would be missing on upgraded deployments - and the pool init hook
+        prepares statements against them, so connect() would fail outright.
+        db/upgrade.sql is safe to re-run and is applied on every startup.
+        """
+        path = os.environ.get("UPGRADE_PATH", "/app/upgrade.sql")
+        if not os.path.exists(path):
+            logger.warning("Upgrade DDL %s not found; skipping", path)
+            return
+        conn = await asyncpg.connect(str(self.dsn))
+        try:
+            await conn.execute(Path(path).read_text(encoding="utf-8"))
+        finally:
+            await conn.close()
+
     async def connect(self) -> None:
-        """Create the connection pool if it doesn't already exist."""
+        """Create the connection pool if it doesn't already exist.
+
+        min_size connections are established eagerly so the pool is warm
+        before the first request; idle connections above min_size are
+        recycled after five minutes.
+        """
         if self._pool is None:
+            await self._apply_upgrades()
             self._pool = await asyncpg.create_pool(
-                str(self.dsn), min_size=1, max_size=10
+                str(self.dsn),
+                min_size=self.min_size,
+                max_size=self.max_size,
+                max_inactive_connection_lifetime=300,
+                max_queries=50_000,
+                statement_cache_size=1024,
+                init=init_connection,
+                reset=reset_connection,
             )
 
     async def disconnect(self) -> None:
@@ -53,7 +205,11 @@ def get_db_instance() -> Database:
     global _db_instance
     if _db_instance is None:
         settings = get_settings()
-        _db_instance = Database(settings.database_url)
+        _db_instance = Database(
+            settings.database_url,
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+        )
     return _db_instance
 
 
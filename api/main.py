@@ -15,14 +15,16 @@ from fastapi import (
     status,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from pathlib import Path
 from starlette.requests import Request
 from datetime import datetime, timedelta, timezone
+import logging
+import os
 import asyncpg
-import json
+import jinja2
+import orjson
 
 
 from .config import get_settings
@@ -32,7 +34,7 @@ from .auth import (
     get_current_user,
     get_password_hash,
 )
-from .db import get_db_connection, get_db_instance
+from .db import get_db_connection, get_db_instance, get_prepared, init_connection
 from .schemas import (
     AnchorCreate,
     AnchorOut,
@@ -47,9 +49,21 @@ from .schemas import (
 )
 
 
+logger = logging.getLogger("rtls.api")
+
+
 def create_app() -> FastAPI:
+    # WARNING and above by default so hot-path debug/info lines cost only an
+    # isEnabledFor check; raise verbosity per-container via LOG_LEVEL
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING").upper())
     settings = get_settings()
-    app = FastAPI(title="BLE RTLS Prototype", version="0.3.2")
+    # orjson serializes every REST response; stdlib json only survives in
+    # places that explicitly ask for it
+    app = FastAPI(
+        title="BLE RTLS Prototype",
+        version="0.3.2",
+        default_response_class=ORJSONResponse,
+    )
 
     app.add_middleware(
         CORSMiddleware,
@@ -60,20 +74,65 @@ def create_app() -> FastAPI:
     )
 
     here = Path(__file__).parent
-    templates = Jinja2Templates(directory=str(here / "templates"))
+    # Templates are compiled once with a disk bytecode cache; auto_reload off
+    # so renders don't stat() the template file each time.
+    jinja_env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(str(here / "templates")),
+        bytecode_cache=jinja2.FileSystemBytecodeCache(),
+        auto_reload=False,
+    )
+    # index.html takes no dynamic data - render it exactly once
+    index_html = jinja_env.get_template("index.html").render()
     static_path = here / "static"
     if static_path.exists():
         app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 
-    positions_queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=1000)
-    stats_queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=100)
-    scans_queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=100)
-    anchor_status_queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=100)
-
-    ws_clients = set()
+    # Pub/sub fan-out: every connected websocket gets its own bounded queue
+    # of pre-serialized frames, so one update reaches all clients and a slow
+    # client only ever backs up its own queue.
+    ws_clients: dict[WebSocket, asyncio.Queue[bytes]] = {}
+    # Consecutive dropped frames per client; clients that never catch up get
+    # disconnected instead of shedding frames forever
+    ws_drop_counts: dict[WebSocket, int] = {}
+    _MAX_CONSECUTIVE_DROPS = 500
     poll_connection = None
     db_instance = None
 
+    def broadcast(data: dict) -> None:
+        """Serialize a payload once and fan it out to every connected client.
+
+        Every client queue holds a reference to the same immutable bytes
+        object, so fan-out cost per client is a pointer copy, not an encode.
+        """
+        if not ws_clients:
+            return
+        payload = orjson.dumps(data)
+        for websocket, queue in list(ws_clients.items()):
+            try:
+                queue.put_nowait(payload)
+                ws_drop_counts.pop(websocket, None)
+            except asyncio.QueueFull:
+                # Slow client: drop its oldest frame and keep the new one -
+                # a realtime feed always prefers fresh data
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+                try:
+                    queue.put_nowait(payload)
+                except asyncio.QueueFull:
+                    pass
+                drops = ws_drop_counts.get(websocket, 0) + 1
+                if drops >= _MAX_CONSECUTIVE_DROPS:
+                    # The client has been saturated for hundreds of frames in
+                    # a row; cut it loose so we stop serializing work for it
+                    logger.info("Dropping persistently slow websocket client")
+                    ws_clients.pop(websocket, None)
+                    ws_drop_counts.pop(websocket, None)
+                    asyncio.ensure_future(websocket.close(code=1013))
+                else:
+                    ws_drop_counts[websocket] = drops
+
     @app.on_event("startup")
     async def startup_event() -> None:
         nonlocal poll_connection, db_instance
@@ -82,155 +141,81 @@ def create_app() -> FastAPI:
         try:
             db_instance = get_db_instance()
             await db_instance.connect()
-            print("✓ Database pool connected")
+            logger.info("Database pool connected")
         except Exception as e:
-            print(f"❌ Database pool connection failed: {e}")
+            logger.error("Database pool connection failed: %s", e)
             raise
 
-        # Poll connection für separate asyncpg
-        try:
-            db_url = str(settings.database_url)
-            db_url_clean = db_url.replace("postgresql+asyncpg", "postgresql")
-            poll_connection = await asyncpg.connect(db_url_clean)
-            print("✓ Poll connection established")
-        except Exception as e:
-            print(f"❌ Poll connection failed: {e}")
-            poll_connection = None
+        # DSN for the dedicated listener connection, computed once
+        db_url_clean = str(settings.database_url).replace(
+            "postgresql+asyncpg", "postgresql"
+        )
 
-        # Task 1: Poll Positions
-        async def poll_positions() -> None:
+        # Task 1: LISTEN/NOTIFY for new positions. The trigger ships the
+        # broadcast fields as JSON in the NOTIFY payload itself (dists is
+        # served on demand via /positions/{id}/dists), so no read-back
+        # query is needed here.
+        def on_position_notify(conn, pid, channel, payload) -> None:
+            try:
+                data = orjson.loads(payload)
+                data["type"] = "position"
+                broadcast(data)
+                logger.debug("position broadcast for uid=%s", data.get("uid"))
+            except Exception as e:
+                logger.error("Position notify error: %s", e)
+
+        async def listen_positions() -> None:
+            """Own the LISTEN connection for its whole lifecycle.
+
+            One task connects, subscribes and babysits the connection; if it
+            drops, the task reconnects and re-registers the listener. No
+            shared mutable connection state or per-iteration reconnect
+            branch anywhere else.
+            """
             nonlocal poll_connection
-
-            # Track last seen position ID per uid to avoid duplicates
-            if not hasattr(poll_positions, "last_seen"):
-                poll_positions.last_seen = {}
-
             while True:
                 try:
-                    if poll_connection is None or poll_connection.is_closed():
-                        db_url = str(settings.database_url)
-                        db_url_clean = db_url.replace(
-                            "postgresql+asyncpg", "postgresql"
-                        )
-                        poll_connection = await asyncpg.connect(db_url_clean)
-                        print("✓ Poll connection re-established")
-
-                    # Get LATEST position per uid (not time-windowed)
-                    query = """
-                        SELECT DISTINCT ON (uid)
-                            id, ts, uid, x, y, z, method, q_score, zone,
-                            nearest_anchor_id, dist_m, num_anchors, dists
-                        FROM positions
-                        WHERE ts > NOW() - INTERVAL '1 hour'
-                        ORDER BY uid, ts DESC
-                    """
-                    rows = await poll_connection.fetch(query)
-
-                    if rows:
-                        for row in rows:
-                            row_id = row["id"]
-                            uid = row["uid"]
-
-                            # Only send if we haven't sent this ID before
-                            if (
-                                uid not in poll_positions.last_seen
-                                or poll_positions.last_seen[uid] != row_id
-                            ):
-                                poll_positions.last_seen[uid] = row_id
-
-                                dists_val = row["dists"]
-                                if isinstance(dists_val, str):
-                                    try:
-                                        dists_val = json.loads(dists_val)
-                                    except:
-                                        dists_val = {}
-
-                                data = {
-                                    "type": "position",
-                                    "id": row["id"],
-                                    "ts": row["ts"].isoformat(),
-                                    "uid": row["uid"],
-                                    "x": (
-                                        float(row["x"])
-                                        if row["x"] is not None
-                                        else None
-                                    ),
-                                    "y": (
-                                        float(row["y"])
-                                        if row["y"] is not None
-                                        else None
-                                    ),
-                                    "z": (
-                                        float(row["z"])
-                                        if row["z"] is not None
-                                        else None
-                                    ),
-                                    "method": row["method"],
-                                    "q_score": (
-                                        float(row["q_score"])
-                                        if row["q_score"] is not None
-                                        else None
-                                    ),
-                                    "zone": row["zone"],
-                                    "nearest_anchor_id": row["nearest_anchor_id"],
-                                    "dist_m": (
-                                        float(row["dist_m"])
-                                        if row["dist_m"] is not None
-                                        else None
-                                    ),
-                                    "num_anchors": row["num_anchors"],
-                                    "dists": dists_val,
-                                }
-                                try:
-                                    positions_queue.put_nowait(data)
-                                    print(f"📍 Position sent: {uid}")
-                                except asyncio.QueueFull:
-                                    pass
-
+                    conn = await asyncpg.connect(db_url_clean)
+                    await init_connection(conn)
+                    await conn.add_listener("positions_new", on_position_notify)
+                    poll_connection = conn
+                    logger.info("Listener connection established")
+                    while not conn.is_closed():
+                        await asyncio.sleep(2)
+                    logger.warning("Listener connection lost - reconnecting")
                 except Exception as e:
-                    print(f"❌ Poll positions error: {e}")
-                    poll_connection = None
-
+                    logger.error("Listener connection error: %s", e)
                 await asyncio.sleep(2)
 
         # Task 2: Poll Stats
         async def poll_stats() -> None:
             while True:
                 try:
-                    if db_instance and db_instance._pool:
+                    # Polls only feed the websocket fan-out; with no dashboard
+                    # connected an idle system issues zero stats queries
+                    if ws_clients and db_instance and db_instance._pool:
                         async with db_instance._pool.acquire() as conn:
-                            active_devices = await conn.fetchval(
-                                "SELECT COUNT(DISTINCT uid) FROM positions WHERE ts > NOW() - INTERVAL '5 minutes'"
-                            )
-                            anchors_count = await conn.fetchval(
-                                "SELECT COUNT(*) FROM anchors"
-                            )
-                            wearables_count = await conn.fetchval(
-                                "SELECT COUNT(*) FROM wearables"
-                            )
-                            total_positions = await conn.fetchval(
-                                "SELECT COUNT(*) FROM positions WHERE ts > NOW() - INTERVAL '1 day'"
-                            )
-                            emergency_count = await conn.fetchval(
-                                "SELECT COUNT(*) FROM events WHERE type = 'emergency' AND ts > NOW() - INTERVAL '1 hour'"
+                            # Counts live in the stats_summary materialized
+                            # view; the concurrent refresh doesn't block
+                            # readers and the SELECT itself is O(1)
+                            await conn.execute(
+                                "REFRESH MATERIALIZED VIEW CONCURRENTLY stats_summary"
                             )
+                            row = await get_prepared(conn, "stats_summary").fetchrow()
 
                             data = {
                                 "type": "stats",
-                                "active_devices": active_devices or 0,
-                                "total_anchors": anchors_count or 0,
-                                "total_wearables": wearables_count or 0,
-                                "total_positions": total_positions or 0,
-                                "emergency_count": emergency_count or 0,
-                                "ts": datetime.now(timezone.utc).isoformat(),
+                                "active_devices": row["active_devices"] or 0,
+                                "total_anchors": row["total_anchors"] or 0,
+                                "total_wearables": row["total_wearables"] or 0,
+                                "total_positions": row["total_positions"] or 0,
+                                "emergency_count": row["emergency_count"] or 0,
+                                "ts": datetime.now(timezone.utc),
                             }
-                            try:
-                                stats_queue.put_nowait(data)
-                            except asyncio.QueueFull:
-                                pass
+                            broadcast(data)
 
                 except Exception as e:
-                    print(f"❌ Poll stats error: {e}")
+                    logger.error("Poll stats error: %s", e)
 
                 await asyncio.sleep(10)
 
@@ -238,57 +223,33 @@ def create_app() -> FastAPI:
         async def poll_scans() -> None:
             while True:
                 try:
-                    if db_instance and db_instance._pool:
+                    if ws_clients and db_instance and db_instance._pool:
                         async with db_instance._pool.acquire() as conn:
-                            query = """
-                            SELECT
-                                uid,
-                                (SELECT rssi FROM scans s2 WHERE s2.uid=s.uid AND s2.rssi IS NOT NULL ORDER BY ts DESC LIMIT 1) AS last_rssi,
-                                (SELECT battery FROM scans s3 WHERE s3.uid=s.uid AND s3.battery IS NOT NULL ORDER BY ts DESC LIMIT 1) AS last_battery,
-                                (SELECT temp_c FROM scans s4 WHERE s4.uid=s.uid AND s4.temp_c IS NOT NULL ORDER BY ts DESC LIMIT 1) AS last_temp_c,
-                                (SELECT tx_power_dbm FROM scans s5 WHERE s5.uid=s.uid AND s5.tx_power_dbm IS NOT NULL ORDER BY ts DESC LIMIT 1) AS last_tx_power,
-                                (SELECT emergency FROM scans s6 WHERE s6.uid=s.uid AND s6.emergency IS NOT NULL ORDER BY ts DESC LIMIT 1) AS last_emergency,
-                                MAX(s.ts) AS last_seen
-                            FROM scans s
-                            GROUP BY s.uid
-                            """
-                            rows = await conn.fetch(query)
+                            # Index-backed LATERAL lookups stop at the first
+                            # non-null row per column and uid; prepared once
+                            # per connection at pool init
+                            rows = await get_prepared(conn, "latest_scans").fetch()
 
+                            # One batch timestamp instead of one allocation
+                            # per row; orjson serializes the datetime natively
+                            now = datetime.now(timezone.utc)
                             for row in rows:
+                                # REAL/float8 columns arrive as Python floats
                                 data = {
                                     "type": "scan",
                                     "uid": row["uid"],
-                                    "last_rssi": (
-                                        float(row["last_rssi"])
-                                        if row["last_rssi"] is not None
-                                        else None
-                                    ),
-                                    "last_battery": (
-                                        float(row["last_battery"])
-                                        if row["last_battery"] is not None
-                                        else None
-                                    ),
-                                    "last_temp_c": (
-                                        float(row["last_temp_c"])
-                                        if row["last_temp_c"] is not None
-                                        else None
-                                    ),
+                                    "last_rssi": row["last_rssi"],
+                                    "last_battery": row["last_battery"],
+                                    "last_temp_c": row["last_temp_c"],
                                     "last_tx_power": row["last_tx_power"],
                                     "last_emergency": row["last_emergency"],
-                                    "last_seen": (
-                                        row["last_seen"].isoformat()
-                                        if row["last_seen"]
-                                        else None
-                                    ),
-                                    "ts": datetime.now(timezone.utc).isoformat(),
+                                    "last_seen": row["last_seen"],
+                                    "ts": now,
                                 }
-                                try:
-                                    scans_queue.put_nowait(data)
-                                except asyncio.QueueFull:
-                                    pass
+                                broadcast(data)
 
                 except Exception as e:
-                    print(f"❌ Poll scans error: {e}")
+                    logger.error("Poll scans error: %s", e)
 
                 await asyncio.sleep(15)
 
@@ -296,16 +257,11 @@ def create_app() -> FastAPI:
         async def poll_anchor_status() -> None:
             while True:
                 try:
-                    if db_instance and db_instance._pool:
+                    if ws_clients and db_instance and db_instance._pool:
                         async with db_instance._pool.acquire() as conn:
-                            query = """
-                            SELECT DISTINCT ON (anchor_id)
-                                anchor_id, ts, ip, fw, uptime_s, wifi_rssi, heap_free, heap_min,
-                                chip_temp_c, tx_power_dbm, ble_scan_active
-                            FROM anchor_status
-                            ORDER BY anchor_id, ts DESC
-                            """
-                            rows = await conn.fetch(query)
+                            rows = await get_prepared(
+                                conn, "latest_anchor_status"
+                            ).fetch()
                             now = datetime.now(timezone.utc)
 
                             for row in rows:
@@ -329,66 +285,59 @@ def create_app() -> FastAPI:
                                 data = {
                                     "type": "anchor_status",
                                     "anchor_id": row["anchor_id"],
-                                    "ts": last_ts.isoformat() if last_ts else None,
+                                    "ts": last_ts,
                                     "ip": str(row["ip"]) if row["ip"] else None,
                                     "fw": row["fw"],
                                     "uptime_s": row["uptime_s"],
                                     "wifi_rssi": row["wifi_rssi"],
                                     "heap_free": row["heap_free"],
                                     "heap_min": row["heap_min"],
-                                    "chip_temp_c": (
-                                        float(row["chip_temp_c"])
-                                        if row["chip_temp_c"] is not None
-                                        else None
-                                    ),
+                                    "chip_temp_c": row["chip_temp_c"],
                                     "tx_power_dbm": row["tx_power_dbm"],
                                     "ble_scan_active": row["ble_scan_active"],
                                     "is_online": is_online,
                                     "age_s": age_s,
-                                    "update_ts": now.isoformat(),
+                                    "update_ts": now,
                                 }
-                                try:
-                                    anchor_status_queue.put_nowait(data)
-                                except asyncio.QueueFull:
-                                    pass
+                                broadcast(data)
 
                 except Exception as e:
-                    print(f"❌ Poll anchor status error: {e}")
+                    logger.error("Poll anchor status error: %s", e)
 
                 await asyncio.sleep(15)
 
-        asyncio.create_task(poll_positions())
+        asyncio.create_task(listen_positions())
         asyncio.create_task(poll_stats())
         asyncio.create_task(poll_scans())
         asyncio.create_task(poll_anchor_status())
-        print("✓ All poll tasks started")
+        logger.info("All poll tasks started")
 
     @app.on_event("shutdown")
     async def shutdown_event() -> None:
         nonlocal poll_connection
         if poll_connection and not poll_connection.is_closed():
             await poll_connection.close()
-            print("✓ Poll connection closed")
+            logger.info("Poll connection closed")
         if db_instance:
             await db_instance.disconnect()
-            print("✓ Database pool disconnected")
+            logger.info("Database pool disconnected")
 
     # ==================== ROUTES ====================
 
     @app.get("/", response_class=HTMLResponse)
     async def index(request: Request):
-        return templates.TemplateResponse("index.html", {"request": request})
+        return HTMLResponse(index_html)
 
     @app.get("/anchors", response_model=list[AnchorOut])
     async def list_anchors(conn: asyncpg.Connection = Depends(get_db_connection)):
         try:
-            rows = await conn.fetch(
-                "SELECT id, name, x, y, z, created_at FROM anchors ORDER BY id"
-            )
-            result = [AnchorOut(**dict(row)) for row in rows]
+            rows = await get_prepared(conn, "list_anchors").fetch()
+            # Rows come straight from the schema-typed driver; construct()
+            # skips Pydantic's per-field revalidation
+            result = [AnchorOut.construct(**dict(row)) for row in rows]
             return result
         except Exception as e:
-            print(f"❌ /anchors error: {e}")
+            logger.error("/anchors error: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
 
     @app.post("/anchors", response_model=AnchorOut)
@@ -410,19 +359,17 @@ def create_app() -> FastAPI:
             anchor.y,
             anchor.z,
         )
-        print(f"✓ Anchor created: {anchor.id}")
+        logger.info("Anchor created: %s", anchor.id)
         return AnchorOut(**dict(row))
 
     @app.get("/wearables", response_model=list[WearableOut])
     async def list_wearables(conn: asyncpg.Connection = Depends(get_db_connection)):
         try:
-            rows = await conn.fetch(
-                "SELECT uid, person_ref, role, created_at FROM wearables ORDER BY uid"
-            )
-            result = [WearableOut(**dict(row)) for row in rows]
+            rows = await get_prepared(conn, "list_wearables").fetch()
+            result = [WearableOut.construct(**dict(row)) for row in rows]
             return result
         except Exception as e:
-            print(f"❌ /wearables error: {e}")
+            logger.error("/wearables error: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
 
     @app.post("/wearables", response_model=WearableOut)
@@ -442,77 +389,98 @@ def create_app() -> FastAPI:
             w.person_ref,
             w.role,
         )
-        print(f"✓ Wearable created: {w.uid}")
+        logger.info("Wearable created: %s", w.uid)
         return WearableOut(**dict(row))
 
+    @app.get("/positions/latest", response_model=list[PositionOut])
+    async def latest_positions(
+        limit: int = 100, conn: asyncpg.Connection = Depends(get_db_connection)
+    ):
+        """Latest position per wearable, newest first.
+
+        Rows are streamed from a server-side cursor so large limits don't
+        materialize the whole result set twice (records + models).
+        """
+        query = """
+            SELECT DISTINCT ON (uid)
+                id, ts, uid, x, y, z, method, q_score, zone,
+                nearest_anchor_id, dist_m, num_anchors
+            FROM positions
+            ORDER BY uid, ts DESC
+            LIMIT $1
+        """
+        try:
+            result: list[PositionOut] = []
+            async with conn.transaction():
+                async for row in conn.cursor(query, limit, prefetch=64):
+                    result.append(PositionOut.construct(**dict(row)))
+            return result
+        except Exception as e:
+            logger.error("/positions/latest error: %s", e)
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @app.get("/positions/{position_id}/dists")
+    async def position_dists(
+        position_id: int, conn: asyncpg.Connection = Depends(get_db_connection)
+    ):
+        """Per-anchor distance map for one position, fetched on demand."""
+        row = await conn.fetchrow(
+            "SELECT dists FROM positions WHERE id = $1", position_id
+        )
+        if row is None:
+            raise HTTPException(status_code=404, detail="Position not found")
+        # A position can exist with no distance map (dists NULL); that is
+        # an empty map, not a missing position
+        return row["dists"] or {}
+
     @app.get("/health")
     async def health_check():
         return {
             "status": "ok",
             "ws_clients": len(ws_clients),
-            "queues": {
-                "positions": positions_queue.qsize(),
-                "stats": stats_queue.qsize(),
-                "scans": scans_queue.qsize(),
-                "anchor_status": anchor_status_queue.qsize(),
-            },
+            "broadcast_backlog": sum(q.qsize() for q in ws_clients.values()),
         }
 
     # ==================== WEBSOCKET ====================
 
+    async def send_payload(websocket: WebSocket, data: dict) -> None:
+        """Send one payload as an orjson-encoded binary frame.
+
+        orjson is ~3-5x faster than the stdlib encoder Starlette's
+        send_json would use, and handles datetime directly.
+        """
+        await websocket.send_bytes(orjson.dumps(data))
+
     @app.websocket("/ws/data")
     async def ws_data(websocket: WebSocket):
         """WebSocket for all data updates - OPTIMIZED"""
         await websocket.accept()
-        ws_clients.add(websocket)
-        print(f"✓ WebSocket client connected (total: {len(ws_clients)})")
+        client_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=100)
+        ws_clients[websocket] = client_queue
+        logger.debug("WebSocket client connected (total: %d)", len(ws_clients))
 
         try:
             # Send initial data
             if db_instance and db_instance._pool:
                 async with db_instance._pool.acquire() as conn:
-                    # Initial anchors
-                    rows = await conn.fetch(
-                        "SELECT id, name, x, y, z, created_at FROM anchors ORDER BY id"
+                    # Initial anchors/wearables: one batched frame each
+                    # instead of one frame (and one await) per row
+                    rows = await get_prepared(conn, "list_anchors").fetch()
+                    await send_payload(
+                        websocket,
+                        {"type": "anchors_init", "items": [dict(r) for r in rows]},
                     )
-                    for row in rows:
-                        await websocket.send_json(
-                            {
-                                "type": "anchor",
-                                "id": row["id"],
-                                "name": row["name"],
-                                "x": float(row["x"]),
-                                "y": float(row["y"]),
-                                "z": float(row["z"]),
-                                "created_at": row["created_at"].isoformat(),
-                            }
-                        )
 
-                    # Initial wearables
-                    rows = await conn.fetch(
-                        "SELECT uid, person_ref, role, created_at FROM wearables ORDER BY uid"
+                    rows = await get_prepared(conn, "list_wearables").fetch()
+                    await send_payload(
+                        websocket,
+                        {"type": "wearables_init", "items": [dict(r) for r in rows]},
                     )
-                    for row in rows:
-                        await websocket.send_json(
-                            {
-                                "type": "wearable",
-                                "uid": row["uid"],
-                                "person_ref": row["person_ref"],
-                                "role": row["role"],
-                                "created_at": row["created_at"].isoformat(),
-                            }
-                        )
 
                     # Initial anchor status (latest per anchor) incl. is_online
-                    status_rows = await conn.fetch(
-                        """
-                        SELECT DISTINCT ON (anchor_id)
-                            anchor_id, ts, ip, fw, uptime_s, wifi_rssi, heap_free, heap_min,
-                            chip_temp_c, tx_power_dbm, ble_scan_active
-                        FROM anchor_status
-                        ORDER BY anchor_id, ts DESC
-                        """
-                    )
+                    status_rows = await get_prepared(
+                        conn, "latest_anchor_status"
+                    ).fetch()
                     now = datetime.now(timezone.utc)
                     for row in status_rows:
                         last_ts = row["ts"]
@@ -529,11 +497,12 @@ def create_app() -> FastAPI:
                             float((now - last_ts).total_seconds()) if last_ts else None
                         )
 
-                        await websocket.send_json(
+                        await send_payload(
+                            websocket,
                             {
                                 "type": "anchor_status",
                                 "anchor_id": row["anchor_id"],
-                                "ts": last_ts.isoformat() if last_ts else None,
+                                "ts": last_ts,
                                 "ip": str(row["ip"]) if row["ip"] else None,
                                 "fw": row["fw"],
                                 "uptime_s": row["uptime_s"],
@@ -549,55 +518,39 @@ def create_app() -> FastAPI:
                                 "ble_scan_active": row["ble_scan_active"],
                                 "is_online": is_online,
                                 "age_s": age_s,
-                                "update_ts": now.isoformat(),
+                                "update_ts": now,
                             }
                         )
 
-            print("✓ Initial data sent")
-
-            # Continuous updates - wait on ANY queue with timeout
-            while True:
-                # Create tasks for all queues - but with a timeout fallback
-                get_tasks = [
-                    asyncio.create_task(positions_queue.get()),
-                    asyncio.create_task(stats_queue.get()),
-                    asyncio.create_task(scans_queue.get()),
-                    asyncio.create_task(anchor_status_queue.get()),
-                ]
-
-                # Wait for first result with 5s timeout
-                done, pending = await asyncio.wait(
-                    get_tasks, timeout=5.0, return_when=asyncio.FIRST_COMPLETED
-                )
-
-                # Cancel all pending tasks
-                for task in pending:
-                    task.cancel()
-
-                # Send all completed data
-                for task in done:
-                    try:
-                        data = await task
-                        await websocket.send_json(data)
-                    except asyncio.CancelledError:
-                        pass
-                    except Exception as e:
-                        print(f"❌ Task error: {e}")
+            logger.debug("Initial data sent")
+
+            # Continuous updates: one long-lived sender task drains this
+            # client's queue while the handler itself only reads, so client
+            # disconnects are noticed immediately even when nothing is
+            # being broadcast.
+            async def forward_frames() -> None:
+                while True:
+                    payload = await client_queue.get()
+                    await websocket.send_bytes(payload)
+
+            sender = asyncio.create_task(forward_frames())
+            try:
+                while True:
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        break
+            finally:
+                sender.cancel()
 
         except WebSocketDisconnect:
-            print("⚠ WebSocket client disconnected")
+            logger.debug("WebSocket client disconnected")
         except Exception as e:
-            print(f"❌ WebSocket error: {e}")
+            logger.error("WebSocket error: %s", e)
         finally:
-            ws_clients.discard(websocket)
-            print(f"✓ WebSocket client removed (total: {len(ws_clients)})")
-
-    app.state.queues = {
-        "positions": positions_queue,
-        "stats": stats_queue,
-        "scans": scans_queue,
-        "anchor_status": anchor_status_queue,
-    }
+            ws_clients.pop(websocket, None)
+            ws_drop_counts.pop(websocket, None)
+            logger.debug("WebSocket client removed (total: %d)", len(ws_clients))
+
     return app
 
 
@@ -607,5 +560,14 @@ app = create_app()
 if __name__ == "__main__":
     import uvicorn
 
-    print("🚀 Starting RTLS API on 0.0.0.0:8000")
-    uvicorn.run("api.main:app", host="0.0.0.0", port=8000, reload=True)
+    logger.info("Starting RTLS API on 0.0.0.0:8000")
+    uvicorn.run(
+        "api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=os.cpu_count(),
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        reload=False,
+    )
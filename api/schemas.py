@@ -10,7 +10,6 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, validator
-import json
 
 
 class Role(str, Enum):
@@ -65,20 +64,9 @@ class PositionOut(BaseModel):
     nearest_anchor_id: Optional[str] = None
     dist_m: Optional[float] = None
     num_anchors: Optional[int] = None
+    # JSONB columns are decoded into dicts by the asyncpg connection codec
     dists: Optional[Dict[str, float]] = None
 
-    @validator("dists", pre=True)
-    def convert_dists(cls, v):
-        """Convert JSONB string to dict if necessary"""
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except:
-                return {}
-        elif isinstance(v, dict):
-            return v
-        return {}
-
 
 class ScanOut(BaseModel):
     """Schema für letzte Scan-Daten eines Wearables"""
@@ -2,18 +2,23 @@
 
 from __future__ import annotations
 import asyncio
+import functools
 import os
 from pathlib import Path
-from typing import Sequence
 import asyncpg
 
 
+@functools.lru_cache(maxsize=None)
+def _load_sql(path: str) -> str:
+    """Read a SQL file once; repeated seed runs in tests reuse the cached text."""
+    return Path(path).read_text(encoding="utf-8")
+
+
 async def ensure_schema(conn: asyncpg.Connection) -> None:
     exists = await conn.fetchval("SELECT to_regclass('public.users')")
     if not exists:
         schema_path = os.environ.get("SCHEMA_PATH", "/app/schema.sql")
-        ddl = Path(schema_path).read_text(encoding="utf-8")
-        await conn.execute(ddl)
+        await conn.execute(_load_sql(schema_path))
 
 
 async def seed() -> None:
@@ -27,39 +32,11 @@ async def seed() -> None:
     try:
         await ensure_schema(conn)
 
-        anchors: Sequence[tuple[str, str, float, float, float]] = [
-            ("A-01", "Anchor 1", 5.0, 5.0, 2.5),
-            ("A-02", "Anchor 2", 5.0, 28.0, 2.5),
-        ]
-        for aid, name, x, y, z in anchors:
-            await conn.execute(
-                """
-                INSERT INTO anchors (id, name, x, y, z)
-                VALUES ($1, $2, $3, $4, $5)
-                ON CONFLICT (id) DO NOTHING
-                """,
-                aid,
-                name,
-                x,
-                y,
-                z,
-            )
-
-        wearables: Sequence[tuple[str, str, str]] = [
-            ("W-01", "alice", "builder 1"),
-            ("W-02", "bob", "builder 2"),
-        ]
-        for uid, person, role in wearables:
-            await conn.execute(
-                """
-                INSERT INTO wearables (uid, person_ref, role)
-                VALUES ($1, $2, $3)
-                ON CONFLICT (uid) DO NOTHING
-                """,
-                uid,
-                person,
-                role,
-            )
+        # Anchor/wearable rows live in db/seed.sql only; the same file backs
+        # the Postgres initdb seed, so the two paths can't diverge. The file
+        # is one multi-row INSERT per table, i.e. already a single round-trip.
+        seed_path = os.environ.get("SEED_PATH", "/app/seed.sql")
+        await conn.execute(_load_sql(seed_path))
 
         from api.auth import get_password_hash
 
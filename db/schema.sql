@@ -39,7 +39,14 @@ CREATE TABLE IF NOT EXISTS scans (
 );
 SELECT create_hypertable('scans', 'ts', if_not_exists => TRUE);
 CREATE INDEX IF NOT EXISTS idx_scans_uid_ts ON scans (uid, ts DESC);
+-- Covering index so latest-per-uid aggregations are index-only scans
+CREATE INDEX IF NOT EXISTS idx_scans_uid_ts_incl ON scans (uid, ts DESC)
+    INCLUDE (rssi, battery, temp_c, tx_power_dbm, emergency);
 CREATE INDEX IF NOT EXISTS idx_scans_anchor_ts ON scans (anchor_id, ts DESC);
+-- Serves the locator's per-(uid, anchor) window aggregation as an
+-- index-only scan
+CREATE INDEX IF NOT EXISTS idx_scans_uid_anchor_ts ON scans (uid, anchor_id, ts DESC)
+    INCLUDE (rssi);
 CREATE INDEX IF NOT EXISTS idx_scans_emergency_ts ON scans (emergency, ts DESC);
 
 -- Positions (hypertable)
@@ -77,6 +84,10 @@ CREATE TABLE IF NOT EXISTS events (
     PRIMARY KEY (id, ts)
 );
 SELECT create_hypertable('events', 'ts', if_not_exists => TRUE);
+-- The stats refresh counts recent emergencies; a partial index keeps that
+-- count from scanning non-emergency events
+CREATE INDEX IF NOT EXISTS idx_events_emergency_ts ON events (ts DESC)
+    WHERE type = 'emergency';
 
 -- Anchor Status (hypertable)
 DROP TABLE IF EXISTS anchor_status CASCADE;
@@ -98,6 +109,35 @@ CREATE TABLE IF NOT EXISTS anchor_status (
 SELECT create_hypertable('anchor_status', 'ts', if_not_exists => TRUE);
 CREATE INDEX IF NOT EXISTS idx_anchor_status_anchor_ts ON anchor_status (anchor_id, ts DESC);
 
+-- Notify listeners about new positions (consumed by the API websocket
+-- broadcaster). The payload carries the broadcast fields directly so the
+-- listener doesn't need a read-back query; dists is deliberately excluded
+-- (served on demand) which also keeps the payload under the NOTIFY limit.
+CREATE OR REPLACE FUNCTION notify_positions_new() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('positions_new', json_build_object(
+        'id', NEW.id,
+        'ts', NEW.ts,
+        'uid', NEW.uid,
+        'x', NEW.x,
+        'y', NEW.y,
+        'z', NEW.z,
+        'method', NEW.method,
+        'q_score', NEW.q_score,
+        'zone', NEW.zone,
+        'nearest_anchor_id', NEW.nearest_anchor_id,
+        'dist_m', NEW.dist_m,
+        'num_anchors', NEW.num_anchors
+    )::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_positions_notify ON positions;
+CREATE TRIGGER trg_positions_notify
+AFTER INSERT ON positions
+FOR EACH ROW EXECUTE FUNCTION notify_positions_new();
+
 -- Views
 CREATE OR REPLACE VIEW v_anchor_latest AS
 SELECT DISTINCT ON (anchor_id)
@@ -105,13 +145,38 @@ SELECT DISTINCT ON (anchor_id)
 FROM anchor_status
 ORDER BY anchor_id, ts DESC;
 
+-- Latest values per uid via LATERAL lookups: each one walks the
+-- idx_scans_uid_ts_incl index backwards and stops at the first non-null
+-- row, so cost stays flat as the hypertable grows
 CREATE OR REPLACE VIEW v_wearable_latest AS
-SELECT s.uid,
-       (SELECT s2.battery FROM scans s2 WHERE s2.uid=s.uid AND s2.battery IS NOT NULL ORDER BY ts DESC LIMIT 1) AS last_battery_v,
-       (SELECT s3.temp_c FROM scans s3 WHERE s3.uid=s.uid AND s3.temp_c IS NOT NULL ORDER BY ts DESC LIMIT 1) AS last_temp_c,
-       max(s.ts) AS last_seen
-FROM scans s
-GROUP BY s.uid;
+SELECT w.uid,
+       b.battery AS last_battery_v,
+       t.temp_c AS last_temp_c,
+       s.ts AS last_seen
+FROM wearables w
+JOIN LATERAL (
+    SELECT ts FROM scans WHERE uid = w.uid
+    ORDER BY ts DESC LIMIT 1
+) s ON TRUE
+LEFT JOIN LATERAL (
+    SELECT battery FROM scans WHERE uid = w.uid AND battery IS NOT NULL
+    ORDER BY ts DESC LIMIT 1
+) b ON TRUE
+LEFT JOIN LATERAL (
+    SELECT temp_c FROM scans WHERE uid = w.uid AND temp_c IS NOT NULL
+    ORDER BY ts DESC LIMIT 1
+) t ON TRUE;
+
+-- Dashboard stats, refreshed periodically by the API's poll_stats task.
+-- The unique index lets REFRESH ... CONCURRENTLY run without blocking readers.
+CREATE MATERIALIZED VIEW IF NOT EXISTS stats_summary AS
+SELECT 1 AS id,
+       (SELECT COUNT(DISTINCT uid) FROM positions WHERE ts > NOW() - INTERVAL '5 minutes') AS active_devices,
+       (SELECT COUNT(*) FROM anchors) AS total_anchors,
+       (SELECT COUNT(*) FROM wearables) AS total_wearables,
+       (SELECT COUNT(*) FROM positions WHERE ts > NOW() - INTERVAL '1 day') AS total_positions,
+       (SELECT COUNT(*) FROM events WHERE type = 'emergency' AND ts > NOW() - INTERVAL '1 hour') AS emergency_count;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_stats_summary_id ON stats_summary (id);
 
 -- Users (Basis)
 CREATE TABLE IF NOT EXISTS users (
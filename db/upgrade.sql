@@ -0,0 +1,80 @@
+-- db/upgrade.sql
+--
+-- Idempotent DDL for objects added after the initial schema rollout.
+-- initdb only runs schema.sql/seed.sql on a *fresh* db_data volume, and
+-- ensure_schema in the seed script is gated on the users table being
+-- absent - so upgraded deployments would otherwise never receive these.
+-- The API executes this file on every startup (see Database.connect);
+-- every statement below must be safe to re-run.
+
+-- Covering index so latest-per-uid lookups are index-only scans
+CREATE INDEX IF NOT EXISTS idx_scans_uid_ts_incl ON scans (uid, ts DESC)
+    INCLUDE (rssi, battery, temp_c, tx_power_dbm, emergency);
+
+-- Serves the locator's per-(uid, anchor) window aggregation as an
+-- index-only scan
+CREATE INDEX IF NOT EXISTS idx_scans_uid_anchor_ts ON scans (uid, anchor_id, ts DESC)
+    INCLUDE (rssi);
+
+-- The stats refresh counts recent emergencies; a partial index keeps that
+-- count from scanning non-emergency events
+CREATE INDEX IF NOT EXISTS idx_events_emergency_ts ON events (ts DESC)
+    WHERE type = 'emergency';
+
+-- Dashboard stats, refreshed periodically by the API's poll_stats task.
+-- The unique index lets REFRESH ... CONCURRENTLY run without blocking readers.
+CREATE MATERIALIZED VIEW IF NOT EXISTS stats_summary AS
+SELECT 1 AS id,
+       (SELECT COUNT(DISTINCT uid) FROM positions WHERE ts > NOW() - INTERVAL '5 minutes') AS active_devices,
+       (SELECT COUNT(*) FROM anchors) AS total_anchors,
+       (SELECT COUNT(*) FROM wearables) AS total_wearables,
+       (SELECT COUNT(*) FROM positions WHERE ts > NOW() - INTERVAL '1 day') AS total_positions,
+       (SELECT COUNT(*) FROM events WHERE type = 'emergency' AND ts > NOW() - INTERVAL '1 hour') AS emergency_count;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_stats_summary_id ON stats_summary (id);
+
+-- Notify listeners about new positions (consumed by the API websocket
+-- broadcaster). Payload mirrors the broadcast fields; dists is excluded.
+CREATE OR REPLACE FUNCTION notify_positions_new() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('positions_new', json_build_object(
+        'id', NEW.id,
+        'ts', NEW.ts,
+        'uid', NEW.uid,
+        'x', NEW.x,
+        'y', NEW.y,
+        'z', NEW.z,
+        'method', NEW.method,
+        'q_score', NEW.q_score,
+        'zone', NEW.zone,
+        'nearest_anchor_id', NEW.nearest_anchor_id,
+        'dist_m', NEW.dist_m,
+        'num_anchors', NEW.num_anchors
+    )::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_positions_notify ON positions;
+CREATE TRIGGER trg_positions_notify
+AFTER INSERT ON positions
+FOR EACH ROW EXECUTE FUNCTION notify_positions_new();
+
+-- Latest values per uid via LATERAL lookups (see schema.sql for rationale)
+CREATE OR REPLACE VIEW v_wearable_latest AS
+SELECT w.uid,
+       b.battery AS last_battery_v,
+       t.temp_c AS last_temp_c,
+       s.ts AS last_seen
+FROM wearables w
+JOIN LATERAL (
+    SELECT ts FROM scans WHERE uid = w.uid
+    ORDER BY ts DESC LIMIT 1
+) s ON TRUE
+LEFT JOIN LATERAL (
+    SELECT battery FROM scans WHERE uid = w.uid AND battery IS NOT NULL
+    ORDER BY ts DESC LIMIT 1
+) b ON TRUE
+LEFT JOIN LATERAL (
+    SELECT temp_c FROM scans WHERE uid = w.uid AND temp_c IS NOT NULL
+    ORDER BY ts DESC LIMIT 1
+) t ON TRUE;
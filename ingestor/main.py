@@ -5,7 +5,7 @@
     - rtls/anchor/+/scan    -> table scans  (now with temp_c, tx_power_dbm, adv_seq, flags, emergency)
     - rtls/anchor/+/status  -> table anchor_status
     - rtls/events           -> table events
-- Validates JSON via Pydantic
+- Validates JSON into slotted dataclasses (minimal checks in from_payload)
 - Converts timestamps (ms since epoch) to timestamptz; falls back to now()
 - Batches inserts with size/time thresholds
 - Skips rows with unknown anchor_id / uid (FK) without aborting whole batch
@@ -16,20 +16,24 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
 import signal
 import socket
+import threading
 import time
 import uuid
-from dataclasses import dataclass
+import weakref
+from collections import deque
+from operator import attrgetter
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple, Set
+from typing import Deque, List, Optional, Set, Tuple
 
 import asyncpg
+import orjson
 import paho.mqtt.client as mqtt
-from pydantic import BaseModel, ValidationError, Field
+import uvloop
 
 # --------------------------- Logging -----------------------------------------
 
@@ -59,6 +63,17 @@ MQTT_QOS = int(os.getenv("MQTT_QOS", "1"))
 
 BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "200"))
 BATCH_MAX_AGE_S = float(os.getenv("BATCH_MAX_AGE_S", "1.0"))
+# Ceiling for the adaptive scan-batch cap; COPY handles batches this large
+# comfortably while bounding memory during bursts.
+BATCH_HARD_MAX = int(os.getenv("BATCH_HARD_MAX", "5000"))
+
+# Pool sized to the host so parallel shard flushes get their own
+# connections without oversubscribing Postgres backends.
+POOL_MAX_SIZE = int(os.getenv("POOL_MAX_SIZE", str(min(os.cpu_count() or 4, 16))))
+# Parallel COPY writers for large scan batches, and the batch size below
+# which sharding is not worth the extra connection acquires.
+SCAN_FLUSH_SHARDS = int(os.getenv("SCAN_FLUSH_SHARDS", "4"))
+SCAN_SHARD_MIN_ROWS = int(os.getenv("SCAN_SHARD_MIN_ROWS", "1000"))
 
 IDS_REFRESH_S = int(os.getenv("IDS_REFRESH_S", "60"))
 TS_MIN_EPOCH_MS = int(os.getenv("TS_MIN_EPOCH_MS", "1514764800000"))  # 2018-01-01
@@ -75,25 +90,45 @@ MQTT_CLIENT_ID = os.getenv(
 # --------------------------- Models ------------------------------------------
 
 
-class _TsMixin:
-    ts: Optional[int]
+_ONE_YEAR_MS = 365 * 24 * 3600 * 1000
+
+
+def coerce_ts_dt(
+    ts: Optional[int],
+    now_ms: int,
+    _utc=timezone.utc,
+    _year_ms=_ONE_YEAR_MS,
+    _fromts=datetime.fromtimestamp,
+) -> datetime:
+    """Convert an epoch-ms message timestamp to a tz-aware datetime.
+
+    Callers capture now_ms once per flush batch, so converting a whole
+    batch costs one time.time() call instead of one per message. The
+    defaulted kwargs bind the lookups once at definition time; this runs
+    per message, so locals beat repeated global/attribute lookups.
+    """
+    if ts is None:
+        if not ALLOW_FALLBACK_NOW_TS:
+            raise ValueError("ts missing and fallback disabled")
+        return _fromts(now_ms / 1000.0, tz=_utc)
+    ts_ms = int(ts)
+    if ts_ms < TS_MIN_EPOCH_MS or ts_ms > (now_ms + _year_ms):
+        ts_ms = now_ms
+    return _fromts(ts_ms / 1000.0, tz=_utc)
+
+
+# Plain slotted dataclasses instead of Pydantic models: one of these is
+# built per MQTT message, and full validation was the dominant per-message
+# CPU cost. from_payload() does the minimal checks the flushers rely on
+# (required keys present, rssi numeric) and ignores unknown keys like
+# Pydantic did; anything malformed raises and is logged by on_message.
 
-    def coerce_ts_dt(self) -> datetime:
-        now_ms = int(time.time() * 1000)
-        if self.ts is None:
-            if not ALLOW_FALLBACK_NOW_TS:
-                raise ValueError("ts missing and fallback disabled")
-            return datetime.fromtimestamp(now_ms / 1000.0, tz=timezone.utc)
-        ts_ms = int(self.ts)
-        if ts_ms < TS_MIN_EPOCH_MS or ts_ms > (now_ms + 365 * 24 * 3600 * 1000):
-            ts_ms = now_ms
-        return datetime.fromtimestamp(ts_ms / 1000.0, tz=timezone.utc)
-
-
-class ScanMessage(BaseModel, _TsMixin):
-    ts: Optional[int] = None
-    anchor_id: str = Field(min_length=1, max_length=64)
-    uid: str = Field(min_length=1, max_length=64)
+
+@dataclass(slots=True)
+class ScanMessage:
+    ts: Optional[int]
+    anchor_id: str
+    uid: str
     rssi: float
     adv_seq: Optional[int] = None
     battery: Optional[float] = None  # Volt
@@ -101,9 +136,26 @@ class ScanMessage(BaseModel, _TsMixin):
     tx_power_dbm: Optional[int] = None
     emergency: Optional[bool] = None
 
+    @classmethod
+    def from_payload(cls, d: dict) -> "ScanMessage":
+        return cls(
+            ts=d.get("ts"),
+            anchor_id=str(d["anchor_id"]),
+            uid=str(d["uid"]),
+            rssi=float(d["rssi"]),
+            adv_seq=d.get("adv_seq"),
+            battery=d.get("battery"),
+            temp_c=d.get("temp_c"),
+            tx_power_dbm=d.get("tx_power_dbm"),
+            # coerced here, once per message, so the flush loop builds rows
+            # without per-field conversions
+            emergency=bool(d["emergency"]) if d.get("emergency") is not None else None,
+        )
 
-class AnchorStatus(BaseModel, _TsMixin):
-    ts: Optional[int] = None
+
+@dataclass(slots=True)
+class AnchorStatus:
+    ts: Optional[int]
     anchor_id: str
     ip: Optional[str] = None
     fw: Optional[str] = None
@@ -115,15 +167,43 @@ class AnchorStatus(BaseModel, _TsMixin):
     tx_power_dbm: Optional[int] = None
     ble_scan_active: Optional[bool] = None
 
+    @classmethod
+    def from_payload(cls, d: dict) -> "AnchorStatus":
+        return cls(
+            ts=d.get("ts"),
+            anchor_id=str(d["anchor_id"]),
+            ip=d.get("ip"),
+            fw=d.get("fw"),
+            uptime_s=d.get("uptime_s"),
+            wifi_rssi=d.get("wifi_rssi"),
+            heap_free=d.get("heap_free"),
+            heap_min=d.get("heap_min"),
+            chip_temp_c=d.get("chip_temp_c"),
+            tx_power_dbm=d.get("tx_power_dbm"),
+            ble_scan_active=d.get("ble_scan_active"),
+        )
+
 
-class RtlsEvent(BaseModel, _TsMixin):
-    ts: Optional[int] = None
+@dataclass(slots=True)
+class RtlsEvent:
+    ts: Optional[int]
     uid: str
     type: str
     severity: Optional[int] = None
     details: Optional[str] = None
     anchor_id: Optional[str] = None
 
+    @classmethod
+    def from_payload(cls, d: dict) -> "RtlsEvent":
+        return cls(
+            ts=d.get("ts"),
+            uid=str(d["uid"]),
+            type=str(d["type"]),
+            severity=d.get("severity"),
+            details=d.get("details"),
+            anchor_id=d.get("anchor_id"),
+        )
+
 
 # --------------------------- Known IDs cache ---------------------------------
 
@@ -156,21 +236,75 @@ class KnownIds:
 
 # --------------------------- Batch flushers ----------------------------------
 
+# INSERT statements prepared once per pool connection (see init_connection),
+# so no flush re-sends SQL text for Postgres to parse and plan.
+INSERT_STATEMENTS = {
+    "insert_scan": """
+        INSERT INTO scans
+          (ts, anchor_id, uid, rssi, battery, temp_c, tx_power_dbm, adv_seq, flags, emergency)
+        VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10)
+    """,
+    "insert_status": """
+        INSERT INTO anchor_status
+          (ts, anchor_id, ip, fw, uptime_s, wifi_rssi, heap_free, heap_min, chip_temp_c, tx_power_dbm, ble_scan_active)
+        VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11)
+    """,
+    "insert_event": "INSERT INTO events (ts, uid, type, severity, details) VALUES ($1,$2,$3,$4,$5)",
+}
+
+
+# asyncpg.Connection is slotted, so the prepared statements are keyed
+# weakly on the connection instead of being stored as an attribute.
+_conn_stmts: "weakref.WeakKeyDictionary[asyncpg.Connection, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def init_connection(conn: asyncpg.Connection) -> None:
+    _conn_stmts[conn] = {
+        name: await conn.prepare(sql) for name, sql in INSERT_STATEMENTS.items()
+    }
+
+
+def get_prepared(conn: asyncpg.Connection, name: str):
+    # pool.acquire() hands out a PoolConnectionProxy; the registry is keyed
+    # on the underlying connection the init hook saw, so unwrap it first.
+    return _conn_stmts[getattr(conn, "_con", conn)][name]
+
+
+# Pulls the scan fields that follow ts in one C-level call per message.
+_SCAN_FIELDS = attrgetter(
+    "anchor_id", "uid", "rssi", "battery", "temp_c", "tx_power_dbm", "adv_seq"
+)
+
+# Column order of the tuples built in flush_scans (and of the COPY stream).
+SCAN_COLUMNS = (
+    "ts",
+    "anchor_id",
+    "uid",
+    "rssi",
+    "battery",
+    "temp_c",
+    "tx_power_dbm",
+    "adv_seq",
+    "flags",
+    "emergency",
+)
+
 
 async def flush_scans(
     batch: List[ScanMessage], pool: asyncpg.Pool, kid: KnownIds
 ) -> None:
     if not batch:
         return
-    async with pool.acquire() as conn:
-        await kid.ensure_fresh(conn)
     valid = []
     skipped_unknown = 0
+    now_ms = int(time.time() * 1000)
     for msg in batch:
         try:
-            ts = msg.coerce_ts_dt()
+            ts = coerce_ts_dt(msg.ts, now_ms)
         except Exception as e:
-            logger.warning("Skipping scan with bad ts: %s (payload=%s)", e, msg.dict())
+            logger.warning("Skipping scan with bad ts: %s (payload=%s)", e, msg)
             continue
         if msg.anchor_id not in kid.anchors or msg.uid not in kid.wearables:
             skipped_unknown += 1
@@ -181,58 +315,56 @@ async def flush_scans(
                     msg.uid,
                 )
             continue
-        valid.append(
-            (
-                ts,
-                msg.anchor_id,
-                msg.uid,
-                float(msg.rssi),
-                msg.battery,
-                msg.temp_c,
-                msg.tx_power_dbm,
-                msg.adv_seq,
-                None,
-                bool(msg.emergency) if msg.emergency is not None else None,
-            )
-        )
+        valid.append((ts, *_SCAN_FIELDS(msg), None, msg.emergency))
     if not valid:
         if skipped_unknown:
             logger.info(
                 "Scan batch had only unknown FK rows (skipped=%d)", skipped_unknown
             )
         return
+    # Large batches are sharded by hash(uid) and COPYed on separate pool
+    # connections in parallel: each writer streams roughly 1/N of the rows,
+    # and hashing on uid keeps per-wearable ordering within one shard.
+    # Small batches stay on a single connection - the extra acquires would
+    # cost more than they save.
+    if len(valid) >= SCAN_SHARD_MIN_ROWS and SCAN_FLUSH_SHARDS > 1:
+        shards: List[List[tuple]] = [[] for _ in range(SCAN_FLUSH_SHARDS)]
+        for rec in valid:
+            shards[hash(rec[2]) % SCAN_FLUSH_SHARDS].append(rec)
+        await asyncio.gather(
+            *(_copy_scan_shard(pool, shard) for shard in shards if shard)
+        )
+    else:
+        await _copy_scan_shard(pool, valid)
+    logger.info(
+        "Inserted %d scans (skipped %d unknown)", len(valid), skipped_unknown
+    )
+
+
+async def _copy_scan_shard(pool: asyncpg.Pool, records: List[tuple]) -> None:
     async with pool.acquire() as conn:
         try:
-            await conn.executemany(
-                """
-                INSERT INTO scans
-                  (ts, anchor_id, uid, rssi, battery, temp_c, tx_power_dbm, adv_seq, flags, emergency)
-                VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10)
-                """,
-                valid,
-            )
-            logger.info(
-                "Inserted %d scans%s",
-                len(valid),
-                f" (skipped {skipped_unknown} unknown)" if skipped_unknown else "",
+            # COPY streams the whole shard in one protocol round-trip instead
+            # of one parameterized INSERT per row - the scans stream is
+            # append-only telemetry, the ideal COPY workload.
+            await conn.copy_records_to_table(
+                "scans",
+                records=records,
+                columns=SCAN_COLUMNS,
             )
         except asyncpg.exceptions.ForeignKeyViolationError:
             inserted = 0
-            for rec in valid:
+            stmt = get_prepared(conn, "insert_scan")
+            for rec in records:
                 try:
-                    await conn.execute(
-                        """
-                        INSERT INTO scans
-                          (ts, anchor_id, uid, rssi, battery, temp_c, tx_power_dbm, adv_seq, flags, emergency)
-                        VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10)
-                        """,
-                        *rec,
-                    )
+                    await stmt.fetch(*rec)
                     inserted += 1
                 except asyncpg.exceptions.ForeignKeyViolationError:
                     pass
             logger.info(
-                "FK violation during scan batch; inserted %d/%d", inserted, len(valid)
+                "FK violation during scan shard; inserted %d/%d",
+                inserted,
+                len(records),
             )
 
 
@@ -241,16 +373,15 @@ async def flush_status(
 ) -> None:
     if not batch:
         return
-    async with pool.acquire() as conn:
-        await kid.ensure_fresh(conn)
     valid = []
     skipped = 0
+    now_ms = int(time.time() * 1000)
     for msg in batch:
         try:
-            ts = msg.coerce_ts_dt()
+            ts = coerce_ts_dt(msg.ts, now_ms)
         except Exception as e:
             logger.warning(
-                "Skipping status with bad ts: %s (payload=%s)", e, msg.dict()
+                "Skipping status with bad ts: %s (payload=%s)", e, msg
             )
             continue
         if msg.anchor_id not in kid.anchors:
@@ -274,19 +405,8 @@ async def flush_status(
     if not valid:
         return
     async with pool.acquire() as conn:
-        await conn.executemany(
-            """
-            INSERT INTO anchor_status
-              (ts, anchor_id, ip, fw, uptime_s, wifi_rssi, heap_free, heap_min, chip_temp_c, tx_power_dbm, ble_scan_active)
-            VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11)
-            """,
-            valid,
-        )
-        logger.info(
-            "Inserted %d anchor_status rows%s",
-            len(valid),
-            f" (skipped {skipped})" if skipped else "",
-        )
+        await get_prepared(conn, "insert_status").executemany(valid)
+        logger.info("Inserted %d anchor_status rows (skipped %d)", len(valid), skipped)
 
 
 async def flush_events(
@@ -294,15 +414,14 @@ async def flush_events(
 ) -> None:
     if not batch:
         return
-    async with pool.acquire() as conn:
-        await kid.ensure_fresh(conn)
     valid = []
     skipped = 0
+    now_ms = int(time.time() * 1000)
     for msg in batch:
         try:
-            ts = msg.coerce_ts_dt()
+            ts = coerce_ts_dt(msg.ts, now_ms)
         except Exception as e:
-            logger.warning("Skipping event with bad ts: %s (payload=%s)", e, msg.dict())
+            logger.warning("Skipping event with bad ts: %s (payload=%s)", e, msg)
             continue
         if msg.uid not in kid.wearables:
             skipped += 1
@@ -311,15 +430,52 @@ async def flush_events(
     if not valid:
         return
     async with pool.acquire() as conn:
-        await conn.executemany(
-            "INSERT INTO events (ts, uid, type, severity, details) VALUES ($1,$2,$3,$4,$5)",
-            valid,
-        )
-        logger.info(
-            "Inserted %d events%s",
-            len(valid),
-            f" (skipped {skipped})" if skipped else "",
-        )
+        await get_prepared(conn, "insert_event").executemany(valid)
+        logger.info("Inserted %d events (skipped %d)", len(valid), skipped)
+
+
+# --------------------------- Message buffers ----------------------------------
+
+
+@dataclass
+class MsgBuffers:
+    """Raw (topic, payload) buffer shared between the MQTT thread and the loop.
+
+    The MQTT network thread only appends the undecoded bytes under the lock,
+    so paho reads from the broker at link speed; all JSON decoding and
+    classification happens on the event loop after an O(1) swap of the whole
+    deque. maxlen bounds memory if the DB falls behind (oldest dropped first).
+    """
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    raw: Deque[Tuple[str, bytes]] = field(default_factory=lambda: deque(maxlen=20000))
+
+    def swap(self) -> Deque[Tuple[str, bytes]]:
+        with self.lock:
+            raw, self.raw = self.raw, deque(maxlen=20000)
+        return raw
+
+
+def parse_raw(
+    raw: Deque[Tuple[str, bytes]],
+    scans_buf: List[ScanMessage],
+    status_buf: List[AnchorStatus],
+    events_buf: List[RtlsEvent],
+) -> None:
+    """Decode and classify raw MQTT messages into the typed flush buffers."""
+    for topic, payload in raw:
+        try:
+            data = orjson.loads(payload)
+            if topic.startswith("rtls/anchor/") and topic.endswith("/scan"):
+                scans_buf.append(ScanMessage.from_payload(data))
+            elif topic.startswith("rtls/anchor/") and topic.endswith("/status"):
+                status_buf.append(AnchorStatus.from_payload(data))
+            elif topic == "rtls/events":
+                events_buf.append(RtlsEvent.from_payload(data))
+            else:
+                logger.debug("ignored topic %s", topic)
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.warning("Invalid payload on %s: %s", topic, e)
 
 
 # --------------------------- MQTT plumbing -----------------------------------
@@ -327,16 +483,15 @@ async def flush_events(
 
 def build_mqtt_client(
     loop: asyncio.AbstractEventLoop,
-    scan_q: asyncio.Queue[ScanMessage],
-    status_q: asyncio.Queue[AnchorStatus],
-    event_q: asyncio.Queue[RtlsEvent],
+    bufs: MsgBuffers,
+    data_ready: asyncio.Event,
 ) -> mqtt.Client:
     client = mqtt.Client(client_id=MQTT_CLIENT_ID, clean_session=True)
     client.enable_logger()
     client.reconnect_delay_set(min_delay=1, max_delay=30)
     client.will_set(
         "rtls/ingestor/status",
-        payload=json.dumps({"status": "offline", "client_id": MQTT_CLIENT_ID}),
+        payload=orjson.dumps({"status": "offline", "client_id": MQTT_CLIENT_ID}),
         qos=1,
         retain=True,
     )
@@ -346,7 +501,7 @@ def build_mqtt_client(
             logger.info("Connected to MQTT broker at %s:%d", MQTT_HOST, MQTT_PORT)
             c.publish(
                 "rtls/ingestor/status",
-                json.dumps({"status": "online", "client_id": MQTT_CLIENT_ID}),
+                orjson.dumps({"status": "online", "client_id": MQTT_CLIENT_ID}),
                 qos=1,
                 retain=True,
             )
@@ -367,27 +522,12 @@ def build_mqtt_client(
             )
 
     def on_message(c, userdata, msg: mqtt.MQTTMessage):
+        # Runs on paho's network thread: just stash the raw bytes and wake
+        # the loop. Decoding here would throttle the broker read rate.
         try:
-            payload = json.loads(msg.payload.decode("utf-8"))
-            topic = msg.topic
-
-            if topic.startswith("rtls/anchor/") and topic.endswith("/scan"):
-                scan = ScanMessage(**payload)
-                loop.call_soon_threadsafe(scan_q.put_nowait, scan)
-
-            elif topic.startswith("rtls/anchor/") and topic.endswith("/status"):
-                st = AnchorStatus(**payload)
-                loop.call_soon_threadsafe(status_q.put_nowait, st)
-
-            elif topic == "rtls/events":
-                ev = RtlsEvent(**payload)
-                loop.call_soon_threadsafe(event_q.put_nowait, ev)
-
-            else:
-                logger.debug("ignored topic %s", topic)
-
-        except (json.JSONDecodeError, ValidationError) as e:
-            logger.warning("Invalid payload on %s: %s", msg.topic, e)
+            with bufs.lock:
+                bufs.raw.append((msg.topic, msg.payload))
+            loop.call_soon_threadsafe(data_ready.set)
         except Exception as e:
             logger.exception("on_message error: %s", e)
 
@@ -410,18 +550,19 @@ async def run() -> None:
         MQTT_QOS,
     )
 
-    pool = await asyncpg.create_pool(DB_DSN, min_size=1, max_size=10)
+    pool = await asyncpg.create_pool(
+        DB_DSN, min_size=1, max_size=POOL_MAX_SIZE, init=init_connection
+    )
 
     # Load initial known ids
     async with pool.acquire() as conn:
         known = await KnownIds.load(conn)
 
-    scan_q: asyncio.Queue[ScanMessage] = asyncio.Queue(maxsize=10000)
-    status_q: asyncio.Queue[AnchorStatus] = asyncio.Queue(maxsize=2000)
-    event_q: asyncio.Queue[RtlsEvent] = asyncio.Queue(maxsize=2000)
+    bufs = MsgBuffers()
+    data_ready = asyncio.Event()
 
     loop = asyncio.get_event_loop()
-    mqtt_client = build_mqtt_client(loop, scan_q, status_q, event_q)
+    mqtt_client = build_mqtt_client(loop, bufs, data_ready)
 
     stop = asyncio.Event()
 
@@ -439,67 +580,74 @@ async def run() -> None:
     status_buf: List[AnchorStatus] = []
     events_buf: List[RtlsEvent] = []
 
-    last_flush = time.monotonic()
+    last_iter = time.monotonic()
+    # Age is measured from the first message of the current batch, and the
+    # scan size cap follows an EWMA of the arrival rate: light traffic
+    # flushes on age as before, bursts grow batches toward BATCH_HARD_MAX
+    # where COPY is most efficient.
+    first_arrival: Optional[float] = None
+    arrival_rate = 0.0  # messages/second, exponentially smoothed
 
     try:
         while not stop.is_set():
-            timeout = max(0.0, BATCH_MAX_AGE_S - (time.monotonic() - last_flush))
-            did_any = False
+            now_m = time.monotonic()
+            if first_arrival is None:
+                timeout = BATCH_MAX_AGE_S
+            else:
+                timeout = max(0.0, BATCH_MAX_AGE_S - (now_m - first_arrival))
             try:
-                msg = await asyncio.wait_for(scan_q.get(), timeout=timeout)
-                scans_buf.append(msg)
-                did_any = True
+                await asyncio.wait_for(data_ready.wait(), timeout=timeout)
             except asyncio.TimeoutError:
                 pass
-
-            # Drain some more from queues (bounded)
-            for _ in range(min(100, scan_q.qsize())):
-                try:
-                    scans_buf.append(scan_q.get_nowait())
-                except asyncio.QueueEmpty:
-                    break
-            for _ in range(min(50, status_q.qsize())):
-                try:
-                    status_buf.append(status_q.get_nowait())
-                except asyncio.QueueEmpty:
-                    break
-            for _ in range(min(50, event_q.qsize())):
-                try:
-                    events_buf.append(event_q.get_nowait())
-                except asyncio.QueueEmpty:
-                    break
-
+            data_ready.clear()
+
+            # One O(1) swap drains everything buffered since last iteration;
+            # decode + classify on the loop, off the MQTT network thread
+            raw = bufs.swap()
+            parse_raw(raw, scans_buf, status_buf, events_buf)
+
+            now_m = time.monotonic()
+            arrived = len(raw)
+            dt = max(now_m - last_iter, 1e-3)
+            last_iter = now_m
+            arrival_rate = 0.8 * arrival_rate + 0.2 * (arrived / dt)
+            if first_arrival is None and arrived:
+                first_arrival = now_m
+
+            scan_cap = min(
+                BATCH_HARD_MAX,
+                max(BATCH_MAX_SIZE, int(arrival_rate * BATCH_MAX_AGE_S * 1.5)),
+            )
             do_flush = (
-                (time.monotonic() - last_flush) >= BATCH_MAX_AGE_S
-                or len(scans_buf) >= BATCH_MAX_SIZE
+                (first_arrival is not None and (now_m - first_arrival) >= BATCH_MAX_AGE_S)
+                or len(scans_buf) >= scan_cap
                 or len(status_buf) >= BATCH_MAX_SIZE // 2
                 or len(events_buf) >= BATCH_MAX_SIZE // 2
             )
 
             if do_flush and (scans_buf or status_buf or events_buf):
-                if scans_buf:
-                    await flush_scans(scans_buf, pool, known)
-                    scans_buf.clear()
-                if status_buf:
-                    await flush_status(status_buf, pool, known)
-                    status_buf.clear()
-                if events_buf:
-                    await flush_events(events_buf, pool, known)
-                    events_buf.clear()
-                last_flush = time.monotonic()
-            elif (
-                did_any is False and (time.monotonic() - last_flush) >= BATCH_MAX_AGE_S
-            ):
-                # periodic flush even if no new data (no-op)
-                last_flush = time.monotonic()
+                # Refresh the known-ID snapshot once, then flush the three
+                # independent tables concurrently on separate pool
+                # connections - wall-clock flush time is the max of the
+                # three instead of their sum.
+                async with pool.acquire() as conn:
+                    await known.ensure_fresh(conn)
+                await asyncio.gather(
+                    flush_scans(scans_buf, pool, known),
+                    flush_status(status_buf, pool, known),
+                    flush_events(events_buf, pool, known),
+                )
+                scans_buf.clear()
+                status_buf.clear()
+                events_buf.clear()
+                first_arrival = None
 
         # final flush
-        if scans_buf:
-            await flush_scans(scans_buf, pool, known)
-        if status_buf:
-            await flush_status(status_buf, pool, known)
-        if events_buf:
-            await flush_events(events_buf, pool, known)
+        await asyncio.gather(
+            flush_scans(scans_buf, pool, known),
+            flush_status(status_buf, pool, known),
+            flush_events(events_buf, pool, known),
+        )
 
     finally:
         try:
@@ -512,6 +660,7 @@ async def run() -> None:
 
 
 if __name__ == "__main__":
+    uvloop.install()
     try:
         asyncio.run(run())
     except KeyboardInterrupt:
@@ -24,9 +24,14 @@
 """
 
 from __future__ import annotations
-import asyncio, json, math, os, logging, time
-from typing import Dict, Tuple, List
+import asyncio, math, os, logging, time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
 import asyncpg
+import numpy as np
+import orjson
+import uvloop
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(level=getattr(logging, LOG_LEVEL, logging.INFO),
@@ -43,24 +48,115 @@ TX_POWER_DBM_AT_1M   = float(os.getenv("TX_POWER_DBM_AT_1M", "-59"))
 PATH_LOSS_EXPONENT   = float(os.getenv("PATH_LOSS_EXPONENT", "2.2"))
 WEIGHT_DIST_CLAMP_M  = float(os.getenv("WEIGHT_DIST_CLAMP_M", "0.5"))
 TOP_K                = int(os.getenv("TOP_K", "3"))
+POOL_MAX_SIZE        = int(os.getenv("POOL_MAX_SIZE", str(min(os.cpu_count() or 4, 16))))
 
 _last_written_ts_monotonic: Dict[str, float] = {}
 
+# BLE RSSI is reported in whole dBm, so the scalar log-distance model only
+# ever sees 129 distinct inputs for the configured (tx_power, n). Precompute
+# them once; index is int(rssi) + 128 for rssi in [-128, 0].
+_DIST_LUT = 10.0 ** (
+    (TX_POWER_DBM_AT_1M - np.arange(-128, 1)) / (10.0 * PATH_LOSS_EXPONENT)
+)
+
 def rssi_to_distance(rssi: float, tx_power: float, n: float) -> float:
+    if (
+        tx_power == TX_POWER_DBM_AT_1M
+        and n == PATH_LOSS_EXPONENT
+        and -128.0 <= rssi <= 0.0
+        and rssi == int(rssi)
+    ):
+        return float(_DIST_LUT[int(rssi) + 128])
     return 10 ** ((tx_power - rssi) / (10.0 * n))
 
+
+@dataclass(slots=True)
+class Scan:
+    """Minimal scan record consumed by estimate_position."""
+    ts: Optional[datetime]
+    anchor_id: str
+    uid: str
+    rssi: float
+    battery: Optional[float] = None
+
+
+def estimate_position(
+    scans: Iterable[Scan],
+    anchors: Dict[str, Tuple[float, float, float]],
+    tx_power_ref: float = TX_POWER_DBM_AT_1M,
+    path_loss_exponent: float = PATH_LOSS_EXPONENT,
+    k: int = TOP_K,
+) -> Tuple[float, float, float, float]:
+    """Weighted-centroid position estimate from a uid's scans.
+
+    Reduces to the best RSSI per known anchor, converts the top-k strongest
+    to distances via the log-distance model and computes the inverse-
+    distance-squared centroid in one vectorized NumPy pass. Returns
+    (x, y, z, q_score); all zeros when no scan maps to a known anchor.
+    """
+    best: Dict[str, float] = {}
+    for sc in scans:
+        aid = sc.anchor_id
+        if aid not in anchors:
+            continue
+        rssi = float(sc.rssi)
+        prev = best.get(aid)
+        if prev is None or rssi > prev:
+            best[aid] = rssi
+    if not best:
+        return 0.0, 0.0, 0.0, 0.0
+
+    top = sorted(best.items(), key=lambda kv: kv[1], reverse=True)[:k]
+    rssi_arr = np.array([v for _, v in top])
+    xyz = np.array([anchors[aid] for aid, _ in top])
+    d = np.power(10.0, (tx_power_ref - rssi_arr) / (10.0 * path_loss_exponent))
+    w = 1.0 / np.square(np.maximum(d, WEIGHT_DIST_CLAMP_M))
+    wtot = float(w.sum())
+    if wtot > 0.0:
+        x, y, z = (xyz * w[:, None]).sum(axis=0) / wtot
+    else:
+        x, y, z = xyz[0]
+
+    num_anchors = len(best)
+    spread = max(best.values()) - min(best.values()) if num_anchors > 1 else 0.0
+    anchor_factor = (
+        min(1.0, (num_anchors - 1) / max(1, k - 1)) if num_anchors > 1 else 0.0
+    )
+    q_score = max(0.0, min(1.0, 0.6 * anchor_factor
+                           + 0.4 * (1.0 - min(1.0, abs(spread) / 40.0))))
+    return float(x), float(y), float(z), float(q_score)
+
 async def fetch_anchors(conn) -> Dict[str, Tuple[float, float, float]]:
     rows = await conn.fetch("SELECT id, x, y, z FROM anchors")
     return {r["id"]: (float(r["x"]), float(r["y"]), float(r["z"])) for r in rows}
 
-async def fetch_recent_scans(conn, seconds: int) -> List[asyncpg.Record]:
+async def fetch_recent_scans(
+    conn, seconds: int, window_seconds: int
+) -> List[asyncpg.Record]:
+    """Best RSSI / latest ts per (uid, anchor) within each uid's window.
+
+    The reduction happens in SQL against the (uid, ts) index, so only one
+    row per (uid, anchor) pair crosses the wire instead of every raw scan.
+    The CTE pins each uid's newest scan inside the query window and the
+    aggregation only considers scans within window_seconds of it, so best
+    RSSI values come from the same per-uid sliding window the old
+    Python-side grouping used - not from the full query window.
+    """
     q = """
-    SELECT ts, anchor_id, uid, rssi
-      FROM scans
-     WHERE ts > now() - make_interval(secs => $1)
-    ORDER BY ts DESC
+    WITH latest AS (
+        SELECT uid, MAX(ts) AS latest_ts
+          FROM scans
+         WHERE ts > now() - make_interval(secs => $1)
+         GROUP BY uid
+    )
+    SELECT s.uid, s.anchor_id, MAX(s.rssi) AS best_rssi, MAX(s.ts) AS latest_ts
+      FROM scans s
+      JOIN latest l USING (uid)
+     WHERE s.ts > now() - make_interval(secs => $1)
+       AND s.ts >= l.latest_ts - make_interval(secs => $2)
+     GROUP BY s.uid, s.anchor_id
     """
-    return await conn.fetch(q, seconds)
+    return await conn.fetch(q, seconds, window_seconds)
 
 def should_throttle(uid: str) -> bool:
     now_m = time.monotonic()
@@ -82,7 +178,7 @@ async def compute_and_store_positions(pool) -> None:
     while True:
         try:
             async with pool.acquire() as conn:
-                scans = await fetch_recent_scans(conn, query_seconds)
+                scans = await fetch_recent_scans(conn, query_seconds, WINDOW_SECONDS)
                 if not scans:
                     await asyncio.sleep(POLL_INTERVAL); continue
 
@@ -90,91 +186,81 @@ async def compute_and_store_positions(pool) -> None:
                 for r in scans:
                     by_uid.setdefault(r["uid"], []).append(r)
 
-                inserted_total = 0
+                to_insert: List[tuple] = []
 
                 for uid, records in by_uid.items():
                     if should_throttle(uid):
                         continue
 
-                    uid_latest_ts = max(r["ts"] for r in records)
-                    uid_window_start = uid_latest_ts - await conn.fetchval("SELECT make_interval(secs => $1)", WINDOW_SECONDS)
+                    # Rows are already reduced to one per (uid, anchor) in
+                    # SQL, bounded to WINDOW_SECONDS of the uid's latest
+                    # scan; only unknown anchors remain to be dropped here.
+                    uid_latest_ts = max(r["latest_ts"] for r in records)
 
-                    filtered = [r for r in records if r["ts"] >= uid_window_start]
-
-                    per_anchor = {}
-                    for rec in filtered:
-                        aid = rec["anchor_id"]
-                        if aid not in anchors:
-                            continue
-                        rssi = float(rec["rssi"]); ts = rec["ts"]
-                        s = per_anchor.get(aid)
-                        if s is None:
-                            per_anchor[aid] = {"best_rssi": rssi, "latest_ts": ts}
-                        else:
-                            if rssi > s["best_rssi"]:
-                                s["best_rssi"] = rssi
-                            if ts > s["latest_ts"]:
-                                s["latest_ts"] = ts
+                    per_anchor = {
+                        r["anchor_id"]: {
+                            "best_rssi": float(r["best_rssi"]),
+                            "latest_ts": r["latest_ts"],
+                        }
+                        for r in records
+                        if r["anchor_id"] in anchors
+                    }
 
                     if not per_anchor:
                         continue
 
-                    now_db = await conn.fetchval("SELECT now()")
+                    now_utc = datetime.now(timezone.utc)
                     dists = {}
                     ages_s = {}
                     for aid, s in per_anchor.items():
                         d = rssi_to_distance(s["best_rssi"], TX_POWER_DBM_AT_1M, PATH_LOSS_EXPONENT)
                         dists[aid] = float(d)
-                        ages_s[aid] = (now_db - s["latest_ts"]).total_seconds()
+                        ages_s[aid] = (now_utc - s["latest_ts"]).total_seconds()
 
                     num_anchors = len(per_anchor)
                     nearest_anchor_id = max(per_anchor.items(), key=lambda kv: kv[1]["best_rssi"])[0]
                     nearest_dist = dists[nearest_anchor_id]
 
-                    if num_anchors >= 2:
-                        top = sorted(per_anchor.items(), key=lambda kv: kv[1]["best_rssi"], reverse=True)[:TOP_K]
-                        wsumx = wsumy = wtot = 0.0
-                        for aid, s in top:
-                            ax, ay, _ = anchors[aid]
-                            d = max(dists[aid], WEIGHT_DIST_CLAMP_M)
-                            w = 1.0/(d*d)
-                            wsumx += w*ax; wsumy += w*ay; wtot += w
-                        if wtot > 0:
-                            x, y = wsumx/wtot, wsumy/wtot
-                            method = "proximity"
+                    uid_scans = [
+                        Scan(ts=s["latest_ts"], anchor_id=aid, uid=uid,
+                             rssi=s["best_rssi"])
+                        for aid, s in per_anchor.items()
+                    ]
+                    x, y, _z, q_score = estimate_position(
+                        uid_scans, anchors,
+                        TX_POWER_DBM_AT_1M, PATH_LOSS_EXPONENT, TOP_K,
+                    )
+                    method = "proximity" if num_anchors >= 2 else "single_anchor"
+                    # The rounded ages dict is built only when DEBUG is on -
+                    # at INFO these comprehensions were pure allocation churn
+                    if logger.isEnabledFor(logging.DEBUG):
+                        rounded_ages = {k: round(v, 2) for k, v in ages_s.items()}
+                        if num_anchors >= 2:
+                            logger.debug("uid=%s proximity: anchors=%s ages=%s", uid, list(per_anchor.keys()), rounded_ages)
                         else:
-                            ax, ay, _ = anchors[nearest_anchor_id]
-                            x, y = ax, ay
-                            method = "fallback_nearest"
-                        logger.debug("uid=%s proximity: anchors=%s ages=%s", uid, list(per_anchor.keys()), {k: round(v,2) for k,v in ages_s.items()})
-                    else:
-                        ax, ay, _ = anchors[nearest_anchor_id]
-                        x, y = ax, ay
-                        method = "single_anchor"
-                        logger.debug("uid=%s single_anchor: only %d anchor in last %ss (aligned to uid_latest=%s, nearest=%s, dist=%.2fm, ages=%s)",
-                                     uid, num_anchors, WINDOW_SECONDS, uid_latest_ts, nearest_anchor_id, nearest_dist,
-                                     {k: round(v,2) for k,v in ages_s.items()})
-
-                    rssi_vals = [s["best_rssi"] for s in per_anchor.values()]
-                    spread = max(rssi_vals) - min(rssi_vals) if len(rssi_vals) > 1 else 0.0
-                    anchor_factor = min(1.0, (num_anchors - 1) / max(1, TOP_K - 1)) if num_anchors > 1 else 0.0
-                    q_score = max(0.0, min(1.0, (0.6*anchor_factor + 0.4*(1.0 - min(1.0, abs(spread)/40.0)))))
-
-                    await conn.execute(
+                            logger.debug("uid=%s single_anchor: only %d anchor in last %ss (aligned to uid_latest=%s, nearest=%s, dist=%.2fm, ages=%s)",
+                                         uid, num_anchors, WINDOW_SECONDS, uid_latest_ts, nearest_anchor_id, nearest_dist,
+                                         rounded_ages)
+
+                    to_insert.append((
+                        now_utc, uid, x, y, 0.0, method, q_score, None,
+                        nearest_anchor_id, float(nearest_dist), int(num_anchors), orjson.dumps(dists).decode()
+                    ))
+
+                if to_insert:
+                    # One batched round-trip per poll instead of one INSERT
+                    # per uid
+                    await conn.executemany(
                         """
                         INSERT INTO positions
                           (ts, uid, x, y, z, method, q_score, zone,
                            nearest_anchor_id, dist_m, num_anchors, dists)
-                        VALUES (now(), $1, $2, $3, $4, $5, $6, $7,
-                                $8, $9, $10, $11)
+                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8,
+                                $9, $10, $11, $12)
                         """,
-                        uid, x, y, 0.0, method, q_score, None,
-                        nearest_anchor_id, float(nearest_dist), int(num_anchors), json.dumps(dists)
+                        to_insert,
                     )
-                    inserted_total += 1
-
-                if inserted_total:
-                    logger.info("inserted %d positions", inserted_total)
+                    logger.info("inserted %d positions", len(to_insert))
 
             await asyncio.sleep(POLL_INTERVAL)
 
@@ -183,11 +269,12 @@ async def compute_and_store_positions(pool) -> None:
             await asyncio.sleep(1.0)
 
 async def main() -> None:
-    pool = await asyncpg.create_pool(DATABASE_URL, min_size=1, max_size=5)
+    pool = await asyncpg.create_pool(DATABASE_URL, min_size=1, max_size=POOL_MAX_SIZE)
     try:
         await compute_and_store_positions(pool)
     finally:
         await pool.close()
 
 if __name__ == "__main__":
+    uvloop.install()
     asyncio.run(main())